@@ -71,17 +71,28 @@ class AvalonMinerAPI:
             sock.sendall(json_cmd.encode('utf-8'))
             time.sleep(0.05)  # Shorter delay for fleet monitoring
 
-            response = b''
+            # Read straight into a preallocated buffer, doubling it when full
+            buf = bytearray(65536)
+            view = memoryview(buf)
+            pos = 0
             while True:
                 try:
-                    chunk = sock.recv(4096)
-                    if not chunk:
+                    n = sock.recv_into(view[pos:])
+                    if not n:
                         break
-                    response += chunk
+                    pos += n
                 except socket.timeout:
                     break
+                if pos == len(buf):
+                    # A bytearray can't be resized while a view is exported
+                    view.release()
+                    buf.extend(bytes(len(buf)))
+                    view = memoryview(buf)
+            view.release()
 
             sock.close()
+            del buf[pos:]
+            response = buf
 
             # Parse JSON response (strip null bytes and whitespace)
             response_str = response.decode('utf-8').rstrip('\x00').strip()
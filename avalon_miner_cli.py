@@ -9,40 +9,164 @@ Copyright (c) 2025
 SPDX-License-Identifier: Apache-2.0
 """
 
+import io
 import sys
 import json
 import socket
-import argparse
+import select
+import functools
+import itertools
+import threading
+import re
 import ipaddress
-from datetime import datetime
-from typing import Dict, Any, Optional
+import os
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, List, NoReturn, Optional, Tuple
+
+try:
+    # Optional: orjson is a much faster drop-in for parsing and dumping JSON
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Parameterless read-only commands that may be combined into a joined request
+_JOINABLE_COMMANDS = frozenset(('version', 'summary', 'estats', 'lcd', 'pools'))
+
+# Read-only CLI commands that may be run against several miners at once
+_BATCH_COMMANDS = frozenset((
+    'version', 'summary', 'estats', 'lcd', 'pools', 'info',
+    'get-fan', 'get-work-mode', 'get-target-temp', 'get-voltage',
+))
+
+def _json_dumps_compact(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: str) -> Any:
+    """Parse a JSON document"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_request(command: str, params: str = '') -> bytes:
+    """Encode an API request body"""
+    request = {"command": command}
+    if params:
+        request["parameter"] = params
+    return _json_dumps_compact(request)
+
+
+# Pre-encoded request bodies for the fixed (command, params) queries
+_STATIC_CMDS = {
+    key: _encode_request(*key)
+    for key in (('version', ''), ('summary', ''), ('estats', ''), ('lcd', ''),
+                ('pools', ''), ('stats', ''), ('config', ''), ('coin', ''),
+                ('devs', ''), ('ascset', '0,voltage'))
+}
+
+# Difficulty unit thresholds, largest first
+_DIFF_UNITS = ((1e15, 'P'), (1e12, 'T'), (1e9, 'G'), (1e6, 'M'), (1e3, 'K'))
+
+# KEY[VALUE] pairs in the MM ID0 string of an ESTATS response
+_ESTATS_KV = re.compile(r'([A-Za-z][A-Za-z0-9_]*)\[([^\]]*)\]')
+
+# Signed integers in PS[...] power supply readings
+_INT_RE = re.compile(r'-?\d+')
+
+# Prefix of informational ascset replies, e.g. "ASC 0 set info: PS[...]"
+_ASC_INFO_PREFIX = 'ASC 0 set info:'
+
+# WORKMODE values reported in ESTATS -> display name
+_WORK_MODE_NAMES = {'0': 'Eco', '1': 'Standard', '2': 'Super'}
+
+# set-work-mode --mode values -> description
+_WORK_MODE_LABELS = {0: "Low/Eco", 1: "Medium/Standard", 2: "High/Super"}
+
+# pool --action -> (API command, progress message)
+_POOL_ACTIONS = {
+    'enable': ('enablepool', 'Enabling pool'),
+    'disable': ('disablepool', 'Disabling pool'),
+    'switch': ('switchpool', 'Switching to pool'),
+}
+
+# Every valid set-pool-priority order: 1-3 distinct pool IDs, e.g. "1,0,2"
+_POOL_PRIORITIES = frozenset(
+    ','.join(map(str, order))
+    for count in range(1, 4)
+    for order in itertools.permutations(range(3), count)
+)
+
+# Read-only command -> section holding its data in a successful response
+_RESPONSE_SECTIONS = {
+    'version': 'VERSION',
+    'summary': 'SUMMARY',
+    'estats': 'STATS',
+    'lcd': 'LCD',
+    'pools': 'POOLS',
+}
+
+
+def _joined_entry(joined: Dict[str, Any], command: str) -> Optional[Dict[str, Any]]:
+    """Return command's response from a joined reply, or None if it failed
+
+    A sub-command that fails inside a join is answered with an error
+    entry (STATUS "E" or "F") instead of its data section.
+    """
+    entries = joined.get(command)
+    if not isinstance(entries, list) or not entries or not isinstance(entries[0], dict):
+        return None
+    entry = entries[0]
+    if _first(entry, 'STATUS').get('STATUS') in ('E', 'F'):
+        return None
+    if _RESPONSE_SECTIONS.get(command, command.upper()) not in entry:
+        return None
+    return entry
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_and_check_private(ip: str) -> None:
+    """Raise ValueError unless ip is a valid private network address"""
+    try:
+        ip_obj = ipaddress.ip_address(ip)
+        if not ip_obj.is_private:
+            raise ValueError(f"IP address {ip} is not a private network address")
+    except ValueError as e:
+        raise ValueError(f"Invalid IP address: {e}")
 
 
 class AvalonMinerAPI:
     """Handle communication with Avalon Miner API"""
 
-    def __init__(self, ip: str, port: int = 4028, timeout: int = 5):
+    def __init__(self, ip: str, port: int = 4028, timeout: int = 5,
+                 recv_idle_timeout: float = 0.5):
         """
         Initialize API connection parameters
 
         Args:
-            ip: Miner IP address
+            ip: Miner IP address (IPv4 or IPv6)
             port: API port (default: 4028)
-            timeout: Socket timeout in seconds (default: 5)
+            timeout: Connect timeout and time to wait for the first response
+                byte, in seconds (default: 5)
+            recv_idle_timeout: Seconds to wait for more data once a complete,
+                NUL-terminated response has been received, in case the miner
+                doesn't close the connection (default: 0.5); an unfinished
+                response gets the full timeout
         """
         self.ip = ip
         self.port = port
         self.timeout = timeout
+        self.recv_idle_timeout = recv_idle_timeout
+        self._joined_commands = True
         self._validate_ip()
 
     def _validate_ip(self):
         """Validate that IP is a valid private network address"""
-        try:
-            ip_obj = ipaddress.ip_address(self.ip)
-            if not ip_obj.is_private:
-                raise ValueError(f"IP address {self.ip} is not a private network address")
-        except ValueError as e:
-            raise ValueError(f"Invalid IP address: {e}")
+        _parse_and_check_private(self.ip)
 
     def send_command(self, command: str, params: str = '') -> Dict[str, Any]:
         """
@@ -55,49 +179,87 @@ class AvalonMinerAPI:
         Returns:
             Dictionary containing the JSON response
         """
-        # Build JSON command
-        if params:
-            json_cmd = json.dumps({
-                "command": command,
-                "parameter": params
-            }, separators=(',', ':'))
-        else:
-            json_cmd = json.dumps({
-                "command": command
-            }, separators=(',', ':'))
+        payload = _STATIC_CMDS.get((command, params))
+        if payload is None:
+            payload = _encode_request(command, params)
+        return self.send_raw(payload)
+
+    def send_raw(self, payload: bytes) -> Dict[str, Any]:
+        """
+        Send a pre-encoded request to the miner API
+
+        Args:
+            payload: UTF-8 encoded JSON request body
 
+        Returns:
+            Dictionary containing the JSON response
+        """
         try:
-            # Create socket connection
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((self.ip, self.port))
-
-            # Send command
-            sock.sendall(json_cmd.encode('utf-8'))
-
-            # Small delay to ensure command is processed
-            import time
-            time.sleep(0.1)
-
-            # Receive response
-            response = b''
-            while True:
-                try:
-                    chunk = sock.recv(4096)
-                    if not chunk:
+            # Create socket connection. The API serves one request per
+            # connection, so there is nothing to keep alive; just disable
+            # Nagle so the small request is sent without delay.
+            sock = socket.create_connection((self.ip, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, 'TCP_QUICKACK'):
+                # Linux: acknowledge response segments immediately rather
+                # than holding the ACK back while the miner is still sending
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+            try:
+                # Send command, then half-close so the miner sees EOF and
+                # closes its side once the response has been written
+                sock.sendall(payload)
+                sock.shutdown(socket.SHUT_WR)
+
+                # Receive response straight into a preallocated buffer until
+                # the miner closes the connection, doubling it when full
+                buf = bytearray(65536)
+                view = memoryview(buf)
+                pos = 0
+                wait = self.timeout
+                while True:
+                    readable, _, _ = select.select([sock], [], [], wait)
+                    if not readable:
+                        if not pos:
+                            raise socket.timeout()
+                        if buf[pos - 1] == 0:
+                            # Complete NUL-terminated response; the miner
+                            # just hasn't closed the connection yet
+                            break
+                        if wait < self.timeout:
+                            # Response stalled mid-way: allow a slow miner
+                            # the full timeout before giving up
+                            wait = self.timeout
+                            continue
+                        raise socket.timeout(
+                            f"response incomplete after {pos} bytes, "
+                            f"no data for {self.timeout}s")
+                    n = sock.recv_into(view[pos:])
+                    if not n:
                         break
-                    response += chunk
-                except socket.timeout:
-                    break
-
-            sock.close()
+                    pos += n
+                    # Once the response is flowing, don't sit out the full
+                    # timeout on a peer that has finished but doesn't close
+                    wait = self.recv_idle_timeout
+                    if pos == len(buf):
+                        # A bytearray can't be resized while a view is exported
+                        view.release()
+                        buf.extend(bytes(len(buf)))
+                        view = memoryview(buf)
+                view.release()
+            finally:
+                sock.close()
+
+            del buf[pos:]
+            response = buf
 
             # Parse JSON response (strip null bytes and whitespace)
             response_str = response.decode('utf-8').rstrip('\x00').strip()
-            return json.loads(response_str)
+            return _json_loads(response_str)
 
-        except socket.timeout:
-            raise ConnectionError(f"Connection timeout to {self.ip}:{self.port}")
+        except socket.timeout as e:
+            detail = f" ({e})" if str(e) else ""
+            raise ConnectionError(f"Connection timeout to {self.ip}:{self.port}{detail}")
         except socket.error as e:
             raise ConnectionError(f"Socket error: {e}")
         except json.JSONDecodeError as e:
@@ -105,6 +267,62 @@ class AvalonMinerAPI:
         except Exception as e:
             raise Exception(f"Error communicating with miner: {e}")
 
+    def send_commands(self, commands: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Send several independent commands to the miner concurrently
+
+        Args:
+            commands: List of (command, params) tuples
+
+        Returns:
+            List of JSON responses in the same order as the commands
+        """
+        # Deferred: concurrent.futures (and the logging it pulls in) is only
+        # needed when commands can't be joined into a single request
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Keep concurrency bounded so the miner's API listener isn't flooded
+        with ThreadPoolExecutor(max_workers=min(4, len(commands))) as executor:
+            return list(executor.map(lambda cmd: self.send_command(*cmd), commands))
+
+    def pipeline(self, commands: List[str]) -> List[Dict[str, Any]]:
+        """
+        Send several read-only commands in a single request
+
+        Uses the API's joined command syntax ("version+summary+..."), which
+        answers all of them in one reply keyed by command name. Falls back
+        to separate requests if the miner doesn't support joined commands.
+
+        Args:
+            commands: List of parameterless read-only command names
+
+        Returns:
+            List of JSON responses in the same order as the commands
+        """
+        responses = {}
+        missing = list(dict.fromkeys(commands))
+        if len(missing) > 1 and self._joined_commands and _JOINABLE_COMMANDS.issuperset(missing):
+            joined = self.send_command('+'.join(missing))
+            if any(c in joined for c in missing):
+                failed = []
+                for command in missing:
+                    entry = _joined_entry(joined, command)
+                    if entry is None:
+                        # Retried on its own below
+                        failed.append(command)
+                    else:
+                        responses[command] = entry
+                missing = failed
+            else:
+                # Older firmware rejects joined commands; don't try again
+                self._joined_commands = False
+
+        if missing:
+            for command, response in zip(missing, self.send_commands([(c, '') for c in missing])):
+                responses[command] = response
+
+        return [responses[command] for command in commands]
+
 
 def format_hashrate(mhs: float, from_mhs: bool = True) -> str:
     """Format hash rate in human-readable format"""
@@ -117,72 +335,121 @@ def format_hashrate(mhs: float, from_mhs: bool = True) -> str:
 
 def format_difficulty(diff: float) -> str:
     """Format difficulty with appropriate unit"""
-    if diff >= 1e15:
-        return f"{diff / 1e15:.2f} P"
-    elif diff >= 1e12:
-        return f"{diff / 1e12:.2f} T"
-    elif diff >= 1e9:
-        return f"{diff / 1e9:.2f} G"
-    elif diff >= 1e6:
-        return f"{diff / 1e6:.2f} M"
-    elif diff >= 1e3:
-        return f"{diff / 1e3:.2f} K"
-    else:
-        return f"{diff:.2f}"
+    for threshold, suffix in _DIFF_UNITS:
+        if diff >= threshold:
+            return f"{diff / threshold:.2f} {suffix}"
+    return f"{diff:.2f}"
 
 
 def format_uptime(seconds: int) -> str:
     """Format uptime in human-readable format"""
-    days = seconds // 86400
-    hours = (seconds % 86400) // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
+    days, rem = divmod(seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, secs = divmod(rem, 60)
     return f"{days}d {hours}h {minutes}m {secs}s"
 
 
 def format_timestamp(unix_time: int) -> str:
     """Convert unix timestamp to readable format"""
+    # Only a few commands print timestamps, so import datetime on demand
+    from datetime import datetime
     return datetime.fromtimestamp(unix_time).strftime('%Y-%m-%d %H:%M:%S')
 
 
-def parse_estats_field(mm_id0: str, field_name: str) -> str:
-    """Parse a field from the MM ID0 string in ESTATS response"""
-    import re
-    pattern = rf'{field_name}\[([^\]]+)\]'
-    match = re.search(pattern, mm_id0)
-    return match.group(1) if match else None
+def print_json(response: Dict[str, Any]) -> None:
+    """Write a response to stdout as indented JSON"""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(response, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; fall back to the stdlib encoder
+            data = None
+        if data is not None:
+            stdout = sys.stdout
+            if isinstance(stdout, io.TextIOWrapper) and stdout.encoding.lower() in ('utf-8', 'utf8'):
+                # orjson already produced UTF-8; skip decoding and re-encoding it
+                stdout.flush()
+                stdout.buffer.write(data)
+            else:
+                stdout.write(data.decode('utf-8'))
+            return
+
+    # Stream straight to stdout; leave non-ASCII characters unescaped
+    json.dump(response, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write('\n')
+
+
+def parse_estats_all(mm_id0: str) -> Dict[str, str]:
+    """Parse all KEY[VALUE] fields from the MM ID0 string in a single pass"""
+    return dict(_ESTATS_KV.findall(mm_id0))
+
+
+def _first(response: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """Return the first entry of a response section (sections are usually lists)"""
+    value = response.get(key)
+    if isinstance(value, list):
+        return value[0] if value else {}
+    return value if isinstance(value, dict) else {}
 
 
 def get_work_mode_name(mode_value: str) -> str:
     """Convert work mode number to name"""
-    mode_map = {
-        '0': 'Eco',
-        '1': 'Standard',
-        '2': 'Super'
-    }
-    return mode_map.get(mode_value, f'Unknown ({mode_value})')
+    return _WORK_MODE_NAMES.get(mode_value, f'Unknown ({mode_value})')
 
 
 def check_status(response: Dict[str, Any]) -> bool:
     """Check if API response indicates success"""
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        # STATUS is an array, access first element
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
+    status = _first(response, 'STATUS')
+    if status:
         status_msg = status.get('Msg', '')
-        if 'ASC 0 set OK' in status_msg or 'OK' in status_msg:
-            return True
+        return (status_msg.startswith('ASC 0 set OK') or status_msg == 'OK'
+                or status_msg.endswith(' OK'))
     return False
 
 
+_NO_CONFIRMATION = "Error: No confirmation on stdin (not a terminal); use --force"
+
+
+def confirm(prompt: str) -> bool:
+    """Ask a yes/no question on stdin; True only if the answer is 'yes'
+
+    Exits with status 1 when stdin is not a terminal and no answer is
+    available: nothing arrives within 100 ms, or stdin is empty or closed
+    (e.g. a script or cron job that forgot --force).
+    """
+    interactive = sys.stdin.isatty()
+    if not interactive:
+        try:
+            ready, _, _ = select.select([sys.stdin], [], [], 0.1)
+        except (OSError, ValueError):
+            # stdin can't be polled (e.g. on Windows); just read it
+            ready = True
+        if not ready:
+            _fail(_NO_CONFIRMATION)
+    try:
+        answer = input(prompt)
+    except EOFError:
+        if not interactive:
+            print()
+            _fail(_NO_CONFIRMATION)
+        # Ctrl-D at the prompt
+        print()
+        return False
+    return answer.lower() == 'yes'
+
+
 # Command implementations
 
 def cmd_version(api: AvalonMinerAPI, args) -> None:
     """Get miner version information"""
     response = api.send_command('version')
 
-    if 'VERSION' in response and len(response['VERSION']) > 0:
-        ver = response['VERSION'][0]
+    if args.json:
+        print_json(response)
+        return
 
+    ver = _first(response, 'VERSION')
+    if ver:
         print("\n=== Miner Version Information ===")
         print(f"Name             : {ver.get('PROD', 'N/A')}")
         print(f"Model            : {ver.get('MODEL', 'N/A')}")
@@ -195,27 +462,28 @@ def cmd_version(api: AvalonMinerAPI, args) -> None:
         print(f"Software Type    : {ver.get('SWTYPE', 'N/A')}")
         print()
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_summary(api: AvalonMinerAPI, args) -> None:
     """Get miner summary statistics"""
-    response = api.send_command('summary')
+    if args.json:
+        print_json(api.send_command('summary'))
+        return
+
+    # Get summary, ESTATS (work mode, power, uptime) and LCD (difficulty) at once
+    response, estats_response, lcd_response = api.pipeline(['summary', 'estats', 'lcd'])
 
-    # Get ESTATS for work mode, power, and uptime info
-    estats_response = api.send_command('estats')
     work_mode = None
     power = None
     uptime = None
-    if 'STATS' in estats_response and len(estats_response['STATS']) > 0:
-        stats = estats_response['STATS'][0] if isinstance(estats_response['STATS'], list) else estats_response['STATS']
+    stats = _first(estats_response, 'STATS')
+    if stats:
         mm_id0 = stats.get('MM ID0', '')
         if mm_id0:
-            work_mode_val = parse_estats_field(mm_id0, 'WORKMODE')
+            fields = parse_estats_all(mm_id0)
+            work_mode_val = fields.get('WORKMODE')
             if work_mode_val:
                 work_mode = get_work_mode_name(work_mode_val)
-            power_val = parse_estats_field(mm_id0, 'MPO')
+            power_val = fields.get('MPO')
             if power_val:
                 power = f"{power_val}W"
 
@@ -223,20 +491,17 @@ def cmd_summary(api: AvalonMinerAPI, args) -> None:
         if elapsed:
             uptime = format_uptime(elapsed)
 
-    # Get LCD for difficulty info
-    lcd_response = api.send_command('lcd')
     current_diff = None
     best_diff = None
-    if 'LCD' in lcd_response and len(lcd_response['LCD']) > 0:
-        lcd = lcd_response['LCD'][0] if isinstance(lcd_response['LCD'], list) else lcd_response['LCD']
+    lcd = _first(lcd_response, 'LCD')
+    if lcd:
         if 'Last Share Difficulty' in lcd:
             current_diff = format_difficulty(lcd['Last Share Difficulty'])
         if 'Best Share' in lcd:
             best_diff = format_difficulty(lcd['Best Share'])
 
-    if 'SUMMARY' in response and len(response['SUMMARY']) > 0:
-        summary = response['SUMMARY'][0] if isinstance(response['SUMMARY'], list) else response['SUMMARY']
-
+    summary = _first(response, 'SUMMARY')
+    if summary:
         print("\n=== Miner Summary ===")
         if uptime:
             print(f"Uptime           : {uptime}")
@@ -257,19 +522,16 @@ def cmd_summary(api: AvalonMinerAPI, args) -> None:
             print(f"Best Diff        : {best_diff}")
         print()
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_estats(api: AvalonMinerAPI, args) -> None:
     """Get extended miner statistics"""
     response = api.send_command('estats')
 
     if args.json:
-        print(json.dumps(response, indent=2))
+        print_json(response)
     else:
-        if 'STATS' in response and len(response['STATS']) > 0:
-            stats = response['STATS'][0] if isinstance(response['STATS'], list) else response['STATS']
+        stats = _first(response, 'STATS')
+        if stats:
             mm_id0 = stats.get('MM ID0', '')
 
             print("\n" + "="*80)
@@ -281,11 +543,13 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
             print(f"Uptime           : {format_uptime(stats.get('Elapsed', 0))}")
 
             if mm_id0:
+                fields = parse_estats_all(mm_id0)
+
                 # Firmware/Version info
-                ver = parse_estats_field(mm_id0, 'Ver')
-                lver = parse_estats_field(mm_id0, 'LVer')
-                dna = parse_estats_field(mm_id0, 'DNA')
-                core = parse_estats_field(mm_id0, 'Core')
+                ver = fields.get('Ver')
+                lver = fields.get('LVer')
+                dna = fields.get('DNA')
+                core = fields.get('Core')
 
                 print(f"\n--- Firmware & Hardware ---")
                 if ver:
@@ -298,12 +562,12 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                     print(f"Core Type        : {core}")
 
                 # Work mode and performance
-                work_mode_val = parse_estats_field(mm_id0, 'WORKMODE')
-                freq = parse_estats_field(mm_id0, 'Freq')
-                ghs_avg = parse_estats_field(mm_id0, 'GHSavg')
-                ghs_spd = parse_estats_field(mm_id0, 'GHSspd')
-                wu = parse_estats_field(mm_id0, 'WU')
-                mpo = parse_estats_field(mm_id0, 'MPO')
+                work_mode_val = fields.get('WORKMODE')
+                freq = fields.get('Freq')
+                ghs_avg = fields.get('GHSavg')
+                ghs_spd = fields.get('GHSspd')
+                wu = fields.get('WU')
+                mpo = fields.get('MPO')
 
                 print(f"\n--- Performance ---")
                 if work_mode_val:
@@ -320,11 +584,11 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                     print(f"Power Output     : {mpo}W")
 
                 # Temperature
-                tmax = parse_estats_field(mm_id0, 'TMax')
-                tavg = parse_estats_field(mm_id0, 'TAvg')
-                tart = parse_estats_field(mm_id0, 'TarT')
-                otemp = parse_estats_field(mm_id0, 'OTemp')
-                itemp = parse_estats_field(mm_id0, 'ITemp')
+                tmax = fields.get('TMax')
+                tavg = fields.get('TAvg')
+                tart = fields.get('TarT')
+                otemp = fields.get('OTemp')
+                itemp = fields.get('ITemp')
 
                 print(f"\n--- Temperature ---")
                 if tmax:
@@ -339,8 +603,8 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                     print(f"Inlet Temp       : {itemp}°C")
 
                 # Fan
-                fan1 = parse_estats_field(mm_id0, 'Fan1')
-                fanr = parse_estats_field(mm_id0, 'FanR')
+                fan1 = fields.get('Fan1')
+                fanr = fields.get('FanR')
 
                 print(f"\n--- Cooling ---")
                 if fan1:
@@ -349,10 +613,9 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                     print(f"Fan Speed (%)    : {fanr}")
 
                 # Power supply
-                ps = parse_estats_field(mm_id0, 'PS')
+                ps = fields.get('PS')
                 if ps:
-                    import re
-                    ps_values = re.findall(r'-?\d+', ps)
+                    ps_values = _INT_RE.findall(ps)
                     if len(ps_values) >= 7:
                         print(f"\n--- Power Supply ---")
                         print(f"Error Code       : {ps_values[0]}")
@@ -362,10 +625,10 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                         print(f"Output Power     : {ps_values[6]} (raw)")
 
                 # Hash/Error statistics
-                hw = parse_estats_field(mm_id0, 'HW')
-                dh = parse_estats_field(mm_id0, 'DH')
-                dhspd = parse_estats_field(mm_id0, 'DHspd')
-                lw = parse_estats_field(mm_id0, 'LW')
+                hw = fields.get('HW')
+                dh = fields.get('DH')
+                dhspd = fields.get('DHspd')
+                lw = fields.get('LW')
 
                 print(f"\n--- Statistics ---")
                 if lw:
@@ -378,9 +641,9 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                     print(f"DH Speed         : {dhspd}")
 
                 # System status
-                sys_status = parse_estats_field(mm_id0, 'SYSTEMSTATU')
-                memfree = parse_estats_field(mm_id0, 'MEMFREE')
-                ping = parse_estats_field(mm_id0, 'PING')
+                sys_status = fields.get('SYSTEMSTATU')
+                memfree = fields.get('MEMFREE')
+                ping = fields.get('PING')
 
                 print(f"\n--- System ---")
                 if sys_status:
@@ -391,8 +654,8 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
                     print(f"Ping             : {ping} ms")
 
                 # Chip info (PLL frequencies and Temps)
-                pll0 = parse_estats_field(mm_id0, 'PLL0')
-                pvt_t0 = parse_estats_field(mm_id0, 'PVT_T0')
+                pll0 = fields.get('PLL0')
+                pvt_t0 = fields.get('PVT_T0')
 
                 if pll0 or pvt_t0:
                     print(f"\n--- Chip Details ---")
@@ -405,18 +668,17 @@ def cmd_estats(api: AvalonMinerAPI, args) -> None:
         else:
             print("Error: No statistics data received")
 
-        if args.json:
-            print("\n--- RAW JSON ---")
-            print(json.dumps(response, indent=2))
-
 
 def cmd_lcd(api: AvalonMinerAPI, args) -> None:
     """Get LCD/active pool information"""
     response = api.send_command('lcd')
 
-    if 'LCD' in response and len(response['LCD']) > 0:
-        lcd = response['LCD'][0] if isinstance(response['LCD'], list) else response['LCD']
+    if args.json:
+        print_json(response)
+        return
 
+    lcd = _first(response, 'LCD')
+    if lcd:
         print("\n=== Active Pool Information ===")
         print(f"Current Pool     : {lcd.get('Current Pool', 'N/A')}")
         print(f"User             : {lcd.get('User', 'N/A')}")
@@ -433,75 +695,78 @@ def cmd_lcd(api: AvalonMinerAPI, args) -> None:
         print(f"Found Blocks     : {lcd.get('Found Blocks', 0)}")
         print()
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_pools(api: AvalonMinerAPI, args) -> None:
     """Get all pool configurations"""
     response = api.send_command('pools')
 
+    if args.json:
+        print_json(response)
+        return
+
     if 'POOLS' in response:
+        # Build the whole report first and write it in one go
+        lines: List[str] = []
         for pool in response['POOLS']:
-            print(f"\n{'='*80}")
-            print(f"Pool Index: {pool.get('POOL', 'N/A')}")
-            print(f"{'='*80}")
-            print(f"URL                     : {pool.get('URL', 'N/A')}")
-            print(f"Status                  : {pool.get('Status', 'N/A')}")
-            print(f"Priority                : {pool.get('Priority', 'N/A')}")
-            print(f"User                    : {pool.get('User', 'N/A')}")
-            print(f"\nGetworks                : {pool.get('Getworks', 0)}")
-            print(f"Accepted                : {pool.get('Accepted', 0)}")
-            print(f"Rejected                : {pool.get('Rejected', 0)}")
-            print(f"Stale                   : {pool.get('Stale', 0)}")
-            print(f"Discarded               : {pool.get('Discarded', 0)}")
-            print(f"Works                   : {pool.get('Works', 0)}")
+            lines.append(f"\n{'='*80}")
+            lines.append(f"Pool Index: {pool.get('POOL', 'N/A')}")
+            lines.append(f"{'='*80}")
+            lines.append(f"URL                     : {pool.get('URL', 'N/A')}")
+            lines.append(f"Status                  : {pool.get('Status', 'N/A')}")
+            lines.append(f"Priority                : {pool.get('Priority', 'N/A')}")
+            lines.append(f"User                    : {pool.get('User', 'N/A')}")
+            lines.append(f"\nGetworks                : {pool.get('Getworks', 0)}")
+            lines.append(f"Accepted                : {pool.get('Accepted', 0)}")
+            lines.append(f"Rejected                : {pool.get('Rejected', 0)}")
+            lines.append(f"Stale                   : {pool.get('Stale', 0)}")
+            lines.append(f"Discarded               : {pool.get('Discarded', 0)}")
+            lines.append(f"Works                   : {pool.get('Works', 0)}")
 
             if 'Last Share Time' in pool and pool['Last Share Time'] > 0:
-                print(f"Last Share Time         : {format_timestamp(pool['Last Share Time'])}")
+                lines.append(f"Last Share Time         : {format_timestamp(pool['Last Share Time'])}")
 
-            print(f"\nHas Stratum             : {pool.get('Has Stratum', False)}")
-            print(f"Stratum Active          : {pool.get('Stratum Active', False)}")
+            lines.append(f"\nHas Stratum             : {pool.get('Has Stratum', False)}")
+            lines.append(f"Stratum Active          : {pool.get('Stratum Active', False)}")
 
             if pool.get('Stratum URL'):
-                print(f"Stratum URL             : {pool.get('Stratum URL', 'N/A')}")
+                lines.append(f"Stratum URL             : {pool.get('Stratum URL', 'N/A')}")
 
             if 'Stratum Difficulty' in pool:
-                print(f"Stratum Difficulty      : {format_difficulty(pool['Stratum Difficulty'])}")
+                lines.append(f"Stratum Difficulty      : {format_difficulty(pool['Stratum Difficulty'])}")
 
             if 'Best Share' in pool:
-                print(f"Best Share              : {format_difficulty(pool['Best Share'])}")
+                lines.append(f"Best Share              : {format_difficulty(pool['Best Share'])}")
 
-            print(f"\nPool Rejected%          : {pool.get('Pool Rejected%', 0):.2f}%")
-            print(f"Pool Stale%             : {pool.get('Pool Stale%', 0):.2f}%")
-            print(f"Bad Work                : {pool.get('Bad Work', 0)}")
-            print(f"Current Block Height    : {pool.get('Current Block Height', 0)}")
-        print()
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+            lines.append(f"\nPool Rejected%          : {pool.get('Pool Rejected%', 0):.2f}%")
+            lines.append(f"Pool Stale%             : {pool.get('Pool Stale%', 0):.2f}%")
+            lines.append(f"Bad Work                : {pool.get('Bad Work', 0)}")
+            lines.append(f"Current Block Height    : {pool.get('Current Block Height', 0)}")
+        lines.append('')
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def cmd_info(api: AvalonMinerAPI, args) -> None:
     """Get comprehensive miner information (combines multiple API calls)"""
-    print("\nGathering miner information...")
-
-    # Get version info
-    ver_response = api.send_command('version')
-    ver = ver_response.get('VERSION', [{}])[0]
+    if not args.json:
+        print("\nGathering miner information...")
 
-    # Get LCD info
-    lcd_response = api.send_command('lcd')
-    lcd_list = lcd_response.get('LCD', [])
-    lcd = lcd_list[0] if isinstance(lcd_list, list) and len(lcd_list) > 0 else {}
+    # Query version, LCD, summary and ESTATS in a single request
+    ver_response, lcd_response, sum_response, estats_response = api.pipeline(
+        ['version', 'lcd', 'summary', 'estats'])
 
-    # Get summary
-    sum_response = api.send_command('summary')
-    summary_list = sum_response.get('SUMMARY', [])
-    summary = summary_list[0] if isinstance(summary_list, list) and len(summary_list) > 0 else {}
+    if args.json:
+        print_json({
+            'version': ver_response,
+            'lcd': lcd_response,
+            'summary': sum_response,
+            'estats': estats_response,
+        })
+        return
+
+    ver = _first(ver_response, 'VERSION')
+    lcd = _first(lcd_response, 'LCD')
+    summary = _first(sum_response, 'SUMMARY')
 
-    # Get ESTATS for additional details
-    estats_response = api.send_command('estats')
     work_mode = None
     power = None
     temp_max = None
@@ -511,35 +776,36 @@ def cmd_info(api: AvalonMinerAPI, args) -> None:
     fan_percent = None
     uptime = None
 
-    if 'STATS' in estats_response and len(estats_response['STATS']) > 0:
-        stats = estats_response['STATS'][0] if isinstance(estats_response['STATS'], list) else estats_response['STATS']
+    stats = _first(estats_response, 'STATS')
+    if stats:
         mm_id0 = stats.get('MM ID0', '')
         if mm_id0:
-            work_mode_val = parse_estats_field(mm_id0, 'WORKMODE')
+            fields = parse_estats_all(mm_id0)
+            work_mode_val = fields.get('WORKMODE')
             if work_mode_val:
                 work_mode = get_work_mode_name(work_mode_val)
 
-            power_val = parse_estats_field(mm_id0, 'MPO')
+            power_val = fields.get('MPO')
             if power_val:
                 power = f"{power_val}W"
 
-            temp_max_val = parse_estats_field(mm_id0, 'TMax')
+            temp_max_val = fields.get('TMax')
             if temp_max_val:
                 temp_max = f"{temp_max_val}°C"
 
-            temp_avg_val = parse_estats_field(mm_id0, 'TAvg')
+            temp_avg_val = fields.get('TAvg')
             if temp_avg_val:
                 temp_avg = f"{temp_avg_val}°C"
 
-            temp_target_val = parse_estats_field(mm_id0, 'TarT')
+            temp_target_val = fields.get('TarT')
             if temp_target_val:
                 temp_target = f"{temp_target_val}°C"
 
-            fan_rpm_val = parse_estats_field(mm_id0, 'Fan1')
+            fan_rpm_val = fields.get('Fan1')
             if fan_rpm_val:
                 fan_rpm = f"{fan_rpm_val} RPM"
 
-            fan_percent_val = parse_estats_field(mm_id0, 'FanR')
+            fan_percent_val = fields.get('FanR')
             if fan_percent_val:
                 fan_percent = fan_percent_val.replace('%', '') + '%'
 
@@ -594,15 +860,9 @@ def cmd_set_fan_speed(api: AvalonMinerAPI, args) -> None:
         params = "0,fan-spd,-1"
         mode = "Auto"
     elif args.speed is not None:
-        if not 25 <= args.speed <= 100:
-            print("Error: Fan speed must be between 25 and 100")
-            sys.exit(1)
         params = f"0,fan-spd,{args.speed}"
         mode = f"Exact ({args.speed}%)"
     elif args.min_speed is not None and args.max_speed is not None:
-        if not (25 <= args.min_speed <= 100 and 25 <= args.max_speed <= 100):
-            print("Error: Fan speeds must be between 25 and 100")
-            sys.exit(1)
         if args.min_speed > args.max_speed:
             print("Error: Minimum speed cannot be greater than maximum speed")
             sys.exit(1)
@@ -612,80 +872,77 @@ def cmd_set_fan_speed(api: AvalonMinerAPI, args) -> None:
         print("Error: Must specify --auto, --speed, or --min-speed and --max-speed")
         sys.exit(1)
 
-    print(f"\nSetting fan speed to {mode}...")
+    if not args.json:
+        print(f"\nSetting fan speed to {mode}...")
     response = api.send_command('ascset', params)
 
+    if args.json:
+        print_json(response)
+        return
+
     if check_status(response):
         print("Fan speed set successfully")
     else:
-        print(f"Command response: {response.get('STATUS', {}).get('Msg', 'Unknown')}")
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+        print(f"Command response: {_first(response, 'STATUS').get('Msg', 'Unknown')}")
 
 
 def cmd_set_work_mode(api: AvalonMinerAPI, args) -> None:
     """Set miner work mode"""
-    mode_names = {
-        0: "Low/Eco",
-        1: "Medium/Standard",
-        2: "High/Super"
-    }
-
-    if args.mode not in [0, 1, 2]:
+    if args.mode not in _WORK_MODE_LABELS:
         print("Error: Work mode must be 0, 1, or 2")
         sys.exit(1)
 
-    print(f"\nSetting work mode to {args.mode} ({mode_names[args.mode]})...")
+    if not args.json:
+        print(f"\nSetting work mode to {args.mode} ({_WORK_MODE_LABELS[args.mode]})...")
     response = api.send_command('ascset', f"0,workmode,set,{args.mode}")
 
+    if args.json:
+        print_json(response)
+        return
+
     if check_status(response):
         print("Work mode set successfully")
     else:
-        # STATUS is an array, access first element
-        status = response.get('STATUS', [{}])[0] if isinstance(response.get('STATUS'), list) else response.get('STATUS', {})
-        print(f"Command response: {status.get('Msg', 'Unknown')}")
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+        print(f"Command response: {_first(response, 'STATUS').get('Msg', 'Unknown')}")
 
 
 def cmd_set_target_temp(api: AvalonMinerAPI, args) -> None:
     """Set miner target temperature"""
-    if not 50 <= args.temperature <= 90:
-        print("Error: Temperature must be between 50 and 90°C")
-        sys.exit(1)
-
-    print(f"\nSetting target temperature to {args.temperature}°C...")
+    if not args.json:
+        print(f"\nSetting target temperature to {args.temperature}°C...")
     response = api.send_command('ascset', f"0,target-temp,{args.temperature}")
 
+    if args.json:
+        print_json(response)
+        return
+
     if check_status(response):
         print("Target temperature set successfully")
         print("\nNote: Temperature will reset to default when miner restarts or work mode changes")
     else:
-        print(f"Command response: {response.get('STATUS', {}).get('Msg', 'Unknown')}")
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+        print(f"Command response: {_first(response, 'STATUS').get('Msg', 'Unknown')}")
 
 
 def cmd_get_voltage(api: AvalonMinerAPI, args) -> None:
     """Get miner voltage information"""
     response = api.send_command('ascset', '0,voltage')
 
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        # STATUS is an array, access first element
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
+    if args.json:
+        print_json(response)
+        return
+
+    status = _first(response, 'STATUS')
+    if status:
         msg = status.get('Msg', '')
         # Parse voltage string: PS[n0 n1 n2 n3 n4 n5 n6 n7 n8]
-        if 'ASC 0 set info:' in msg:
-            voltage_str = msg.replace('ASC 0 set info:', '').strip()
+        _, found, voltage_str = msg.partition(_ASC_INFO_PREFIX)
+        if found:
+            voltage_str = voltage_str.strip()
             print(f"\n=== Voltage Information ===")
             print(f"Raw String       : {voltage_str}")
 
             # Try to parse the values
-            import re
-            matches = re.findall(r'-?\d+', voltage_str)
+            matches = _INT_RE.findall(voltage_str)
             if len(matches) >= 7:
                 print(f"\nError Code       : {matches[0]}")
                 print(f"Reserved 1       : {matches[1]}")
@@ -699,21 +956,23 @@ def cmd_get_voltage(api: AvalonMinerAPI, args) -> None:
                     print(f"Max Allowed Volt : {matches[8]} (raw units)")
             print()
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_get_fan(api: AvalonMinerAPI, args) -> None:
     """Get current fan speed"""
     response = api.send_command('estats')
 
-    if 'STATS' in response and len(response['STATS']) > 0:
-        stats = response['STATS'][0] if isinstance(response['STATS'], list) else response['STATS']
+    if args.json:
+        print_json(response)
+        return
+
+    stats = _first(response, 'STATS')
+    if stats:
         mm_id0 = stats.get('MM ID0', '')
 
         if mm_id0:
-            fan_rpm = parse_estats_field(mm_id0, 'Fan1')
-            fan_percent = parse_estats_field(mm_id0, 'FanR')
+            fields = parse_estats_all(mm_id0)
+            fan_rpm = fields.get('Fan1')
+            fan_percent = fields.get('FanR')
 
             print("\n=== Fan Speed ===")
             if fan_rpm:
@@ -724,20 +983,22 @@ def cmd_get_fan(api: AvalonMinerAPI, args) -> None:
         else:
             print("Error: Could not retrieve fan information")
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_get_work_mode(api: AvalonMinerAPI, args) -> None:
     """Get current work mode"""
     response = api.send_command('estats')
 
-    if 'STATS' in response and len(response['STATS']) > 0:
-        stats = response['STATS'][0] if isinstance(response['STATS'], list) else response['STATS']
+    if args.json:
+        print_json(response)
+        return
+
+    stats = _first(response, 'STATS')
+    if stats:
         mm_id0 = stats.get('MM ID0', '')
 
         if mm_id0:
-            work_mode_val = parse_estats_field(mm_id0, 'WORKMODE')
+            fields = parse_estats_all(mm_id0)
+            work_mode_val = fields.get('WORKMODE')
 
             print("\n=== Work Mode ===")
             if work_mode_val:
@@ -749,22 +1010,24 @@ def cmd_get_work_mode(api: AvalonMinerAPI, args) -> None:
         else:
             print("Error: Could not retrieve work mode information")
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_get_target_temp(api: AvalonMinerAPI, args) -> None:
     """Get current target temperature"""
     response = api.send_command('estats')
 
-    if 'STATS' in response and len(response['STATS']) > 0:
-        stats = response['STATS'][0] if isinstance(response['STATS'], list) else response['STATS']
+    if args.json:
+        print_json(response)
+        return
+
+    stats = _first(response, 'STATS')
+    if stats:
         mm_id0 = stats.get('MM ID0', '')
 
         if mm_id0:
-            target_temp = parse_estats_field(mm_id0, 'TarT')
-            temp_max = parse_estats_field(mm_id0, 'TMax')
-            temp_avg = parse_estats_field(mm_id0, 'TAvg')
+            fields = parse_estats_all(mm_id0)
+            target_temp = fields.get('TarT')
+            temp_max = fields.get('TMax')
+            temp_avg = fields.get('TAvg')
 
             print("\n=== Temperature Settings ===")
             if target_temp:
@@ -777,72 +1040,71 @@ def cmd_get_target_temp(api: AvalonMinerAPI, args) -> None:
         else:
             print("Error: Could not retrieve temperature information")
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_set_voltage(api: AvalonMinerAPI, args) -> None:
     """Set miner voltage"""
-    print(f"\nSetting voltage to {args.voltage}...")
-    print("WARNING: Setting incorrect voltage can damage your miner!")
+    if not args.json:
+        print(f"\nSetting voltage to {args.voltage}...")
+    # Keep stdout parseable when --json is used
+    print("WARNING: Setting incorrect voltage can damage your miner!",
+          file=sys.stderr if args.json else sys.stdout)
 
     if not args.force:
-        confirm = input("Are you sure you want to proceed? (yes/no): ")
-        if confirm.lower() != 'yes':
+        if not confirm("Are you sure you want to proceed? (yes/no): "):
             print("Operation cancelled")
             return
 
     response = api.send_command('ascset', f'0,voltage,{args.voltage}')
 
+    if args.json:
+        print_json(response)
+        return
+
     if check_status(response):
         print("Voltage set successfully")
     else:
-        print(f"Command response: {response.get('STATUS', {}).get('Msg', 'Unknown')}")
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+        print(f"Command response: {_first(response, 'STATUS').get('Msg', 'Unknown')}")
 
 
 def cmd_reboot(api: AvalonMinerAPI, args) -> None:
     """Reboot the miner"""
-    if not 0 <= args.delay <= 300:
-        print("Error: Delay must be between 0 and 300 seconds")
-        sys.exit(1)
-
-    if args.delay > 0:
-        print(f"\nScheduling reboot in {args.delay} seconds...")
-    else:
-        print("\nRebooting miner immediately...")
+    if not args.json:
+        if args.delay > 0:
+            print(f"\nScheduling reboot in {args.delay} seconds...")
+        else:
+            print("\nRebooting miner immediately...")
 
     if not args.force:
-        confirm = input("Are you sure you want to reboot the miner? (yes/no): ")
-        if confirm.lower() != 'yes':
+        if not confirm("Are you sure you want to reboot the miner? (yes/no): "):
             print("Operation cancelled")
             return
 
     response = api.send_command('ascset', f'0,reboot,{args.delay}')
 
+    if args.json:
+        print_json(response)
+        return
+
     if check_status(response):
         print("Reboot command sent successfully")
     else:
-        print(f"Command response: {response.get('STATUS', {}).get('Msg', 'Unknown')}")
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+        print(f"Command response: {_first(response, 'STATUS').get('Msg', 'Unknown')}")
 
 
 def cmd_reset_filter_clean(api: AvalonMinerAPI, args) -> None:
     """Reset filter clean reminder"""
-    print("\nResetting filter clean reminder...")
+    if not args.json:
+        print("\nResetting filter clean reminder...")
     response = api.send_command('ascset', '0,filter-clean,1')
 
+    if args.json:
+        print_json(response)
+        return
+
     if check_status(response):
         print("Filter clean reminder reset successfully")
     else:
-        print(f"Command response: {response.get('STATUS', {}).get('Msg', 'Unknown')}")
-
-    if args.json:
-        print(json.dumps(response, indent=2))
+        print(f"Command response: {_first(response, 'STATUS').get('Msg', 'Unknown')}")
 
 
 def cmd_set_pool(api: AvalonMinerAPI, args) -> None:
@@ -851,267 +1113,544 @@ def cmd_set_pool(api: AvalonMinerAPI, args) -> None:
         print("Error: Pool ID must be 0, 1, or 2")
         sys.exit(1)
 
-    print(f"\nConfiguring pool {args.pool_id}...")
+    if not args.json:
+        print(f"\nConfiguring pool {args.pool_id}...")
     params = f"admin,{args.password},{args.pool_id},{args.url},{args.username},{args.pool_password}"
 
     response = api.send_command('setpool', params)
 
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
-        print(f"Response: {status.get('Msg', 'Unknown')}")
-
     if args.json:
-        print(json.dumps(response, indent=2))
-
-
-def cmd_enable_pool(api: AvalonMinerAPI, args) -> None:
-    """Enable a mining pool"""
-    if not 0 <= args.pool_id <= 2:
-        print("Error: Pool ID must be 0, 1, or 2")
-        sys.exit(1)
+        print_json(response)
+        return
 
-    print(f"\nEnabling pool {args.pool_id}...")
-    response = api.send_command('enablepool', str(args.pool_id))
-
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
+    status = _first(response, 'STATUS')
+    if status:
         print(f"Response: {status.get('Msg', 'Unknown')}")
 
-    if args.json:
-        print(json.dumps(response, indent=2))
 
+def cmd_pool(api: AvalonMinerAPI, args) -> None:
+    """Enable, disable or switch to a mining pool"""
+    command, progress = _POOL_ACTIONS[args.action]
 
-def cmd_disable_pool(api: AvalonMinerAPI, args) -> None:
-    """Disable a mining pool"""
-    if not 0 <= args.pool_id <= 2:
-        print("Error: Pool ID must be 0, 1, or 2")
-        sys.exit(1)
-
-    print(f"\nDisabling pool {args.pool_id}...")
-    response = api.send_command('disablepool', str(args.pool_id))
-
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
-        print(f"Response: {status.get('Msg', 'Unknown')}")
+    if not args.json:
+        print(f"\n{progress} {args.pool_id}...")
+    response = api.send_command(command, str(args.pool_id))
 
     if args.json:
-        print(json.dumps(response, indent=2))
-
+        print_json(response)
+        return
 
-def cmd_switch_pool(api: AvalonMinerAPI, args) -> None:
-    """Switch to a different pool"""
-    if not 0 <= args.pool_id <= 2:
-        print("Error: Pool ID must be 0, 1, or 2")
-        sys.exit(1)
-
-    print(f"\nSwitching to pool {args.pool_id}...")
-    response = api.send_command('switchpool', str(args.pool_id))
-
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
+    status = _first(response, 'STATUS')
+    if status:
         print(f"Response: {status.get('Msg', 'Unknown')}")
 
-    if args.json:
-        print(json.dumps(response, indent=2))
-
 
 def cmd_set_pool_priority(api: AvalonMinerAPI, args) -> None:
     """Set pool priority order"""
     # Validate priority format
-    priorities = args.priority.split(',')
-    if not all(p.strip() in ['0', '1', '2'] for p in priorities):
+    priority = ''.join(args.priority.split())
+    if priority not in _POOL_PRIORITIES:
         print("Error: Priority must be comma-separated pool IDs (0, 1, 2)")
         sys.exit(1)
 
-    print(f"\nSetting pool priority to: {args.priority}")
-    response = api.send_command('poolpriority', args.priority)
+    if not args.json:
+        print(f"\nSetting pool priority to: {priority}")
+    response = api.send_command('poolpriority', priority)
 
-    if 'STATUS' in response and len(response['STATUS']) > 0:
-        status = response['STATUS'][0] if isinstance(response['STATUS'], list) else response['STATUS']
+    if args.json:
+        print_json(response)
+        return
+
+    status = _first(response, 'STATUS')
+    if status:
         print(f"Response: {status.get('Msg', 'Unknown')}")
 
-    if args.json:
-        print(json.dumps(response, indent=2))
 
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that lets worker threads capture their own output"""
 
-def main():
-    """Main entry point"""
-    parser = argparse.ArgumentParser(
-        description='Avalon Miner CLI - Control and monitor Avalon cryptocurrency miners',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Get miner information
-  %(prog)s 192.168.1.100 info
-  %(prog)s 192.168.1.100 version
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
 
-  # Set fan speed
-  %(prog)s 192.168.1.100 set-fan --auto
-  %(prog)s 192.168.1.100 set-fan --speed 80
-  %(prog)s 192.168.1.100 set-fan --min-speed 30 --max-speed 100
+    def start_capture(self) -> None:
+        self._local.buffer = io.StringIO()
 
-  # Set work mode
-  %(prog)s 192.168.1.100 set-work-mode --mode 1
+    def stop_capture(self) -> str:
+        buffer = self._local.buffer
+        self._local.buffer = None
+        return buffer.getvalue()
 
-  # Manage pools
-  %(prog)s 192.168.1.100 pools
-  %(prog)s 192.168.1.100 switch-pool --pool-id 1
-        """
-    )
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer if buffer is not None else self._stream).write(text)
 
-    parser.add_argument('ip', help='Miner IP address')
-    parser.add_argument('--port', type=int, default=4028, help='API port (default: 4028)')
-    parser.add_argument('--timeout', type=int, default=5, help='Connection timeout in seconds (default: 5)')
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
 
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-    subparsers.required = True
 
-    # Information commands
-    version_parser = subparsers.add_parser('version', help='Get miner version information')
-    version_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+def load_hosts_file(path: str) -> List[str]:
+    """Load miner IP addresses from a file (one per line, # starts a comment)"""
+    try:
+        with open(path, 'r') as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        _fail(f"Error: Failed to read hosts file: {e}")
+
+    hosts = []
+    for line in lines:
+        hosts.extend(line.split('#', 1)[0].replace(',', ' ').split())
+    return hosts
+
+
+def _make_api(ip: str, args: 'CliArgs') -> AvalonMinerAPI:
+    """Create the API client for ip from the global command line options"""
+    return AvalonMinerAPI(ip, args.port, args.timeout)
 
-    summary_parser = subparsers.add_parser('summary', help='Get miner summary statistics')
-    summary_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
 
-    estats_parser = subparsers.add_parser('estats', help='Get extended statistics')
-    estats_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+def run_batch(hosts: List[str], args, handler) -> int:
+    """Run a read-only command against several miners concurrently
 
-    lcd_parser = subparsers.add_parser('lcd', help='Get LCD/active pool information')
-    lcd_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    Output is collected per miner and printed in the order the miners were
+    given; with --json a single object keyed by IP is printed instead.
+    Returns the process exit code.
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-    pools_parser = subparsers.add_parser('pools', help='Get all pool configurations')
-    pools_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    stdout = _ThreadLocalStdout(sys.stdout)
+
+    def run_one(ip: str) -> Tuple[str, Optional[str]]:
+        stdout.start_capture()
+        error = None
+        try:
+            api = _make_api(ip, args)
+            handler(api, args)
+        except ConnectionError as e:
+            error = f"Connection Error: {e}"
+        except Exception as e:
+            error = f"Error: {e}"
+        return stdout.stop_capture(), error
 
-    info_parser = subparsers.add_parser('info', help='Get comprehensive miner info (combines multiple calls)')
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=min(16, len(hosts))) as executor:
+            results = list(executor.map(run_one, hosts))
+    finally:
+        sys.stdout = stdout._stream
 
-    # Fan speed control
-    fan_parser = subparsers.add_parser('set-fan', help='Set fan speed')
+    exit_code = 0
+    if args.json:
+        # Merge the per-miner JSON documents into one object keyed by IP
+        combined = {}
+        for ip, (output, error) in zip(hosts, results):
+            if error:
+                print(f"{ip}: {error}", file=sys.stderr)
+                exit_code = 1
+            else:
+                combined[ip] = _json_loads(output)
+        print_json(combined)
+        return exit_code
+
+    for ip, (output, error) in zip(hosts, results):
+        print(f"\n{'#'*80}")
+        print(f"# Miner {ip}")
+        print(f"{'#'*80}")
+        sys.stdout.write(output)
+        if error:
+            sys.stdout.flush()
+            print(error, file=sys.stderr)
+            exit_code = 1
+    return exit_code
+
+
+def ranged_int(low: int, high: int):
+    """argparse type for an integer between low and high (inclusive)"""
+    def check(value: str) -> int:
+        # Only called while parsing, so argparse has been imported already
+        import argparse
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+        if not low <= number <= high:
+            raise argparse.ArgumentTypeError(f"must be between {low} and {high}")
+        return number
+    return check
+
+
+# Subcommand parser builders. Each adds exactly one subparser (inheriting the
+# shared options from parents), with its handler as the func default, so
+# main() only has to build the one it runs.
+
+# Subcommands without options besides --json: name -> (help, handler).
+# build_parser() and parse_cli() both read them from here.
+_SIMPLE_COMMANDS = {
+    'version': ('Get miner version information', cmd_version),
+    'summary': ('Get miner summary statistics', cmd_summary),
+    'estats': ('Get extended statistics', cmd_estats),
+    'lcd': ('Get LCD/active pool information', cmd_lcd),
+    'pools': ('Get all pool configurations', cmd_pools),
+    'info': ('Get comprehensive miner info (combines multiple calls)', cmd_info),
+    'get-voltage': ('Get voltage information', cmd_get_voltage),
+    'get-fan': ('Get current fan speed', cmd_get_fan),
+    'get-work-mode': ('Get current work mode', cmd_get_work_mode),
+    'get-target-temp': ('Get current target temperature', cmd_get_target_temp),
+    'reset-filter-clean': ('Reset filter clean reminder', cmd_reset_filter_clean),
+}
+
+
+def _build_simple(subparsers, parents, name):
+    help_text, handler = _SIMPLE_COMMANDS[name]
+    simple_parser = subparsers.add_parser(name, parents=parents, help=help_text)
+    simple_parser.set_defaults(func=handler)
+    return simple_parser
+
+
+def _build_set_fan(subparsers, parents):
+    fan_parser = subparsers.add_parser('set-fan', parents=parents, help='Set fan speed')
     fan_group = fan_parser.add_mutually_exclusive_group(required=True)
     fan_group.add_argument('--auto', action='store_true', help='Enable automatic fan control')
-    fan_group.add_argument('--speed', type=int, metavar='PCT', help='Set exact fan speed (25-100%%)')
-    fan_parser.add_argument('--min-speed', type=int, metavar='PCT', help='Set minimum fan speed (25-100%%) - use with --max-speed')
-    fan_parser.add_argument('--max-speed', type=int, metavar='PCT', help='Set maximum fan speed (25-100%%) - use with --min-speed')
-    fan_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    fan_group.add_argument('--speed', type=ranged_int(25, 100), metavar='PCT', help='Set exact fan speed (25-100%%)')
+    fan_parser.add_argument('--min-speed', type=ranged_int(25, 100), metavar='PCT', help='Set minimum fan speed (25-100%%) - use with --max-speed')
+    fan_parser.add_argument('--max-speed', type=ranged_int(25, 100), metavar='PCT', help='Set maximum fan speed (25-100%%) - use with --min-speed')
+    fan_parser.set_defaults(func=cmd_set_fan_speed)
+    return fan_parser
 
-    # Work mode
-    work_parser = subparsers.add_parser('set-work-mode', help='Set work mode (0=Low/Eco, 1=Medium/Standard, 2=High/Super)')
+
+def _build_set_work_mode(subparsers, parents):
+    work_parser = subparsers.add_parser('set-work-mode', parents=parents, help='Set work mode (0=Low/Eco, 1=Medium/Standard, 2=High/Super)')
     work_parser.add_argument('--mode', type=int, required=True, choices=[0, 1, 2],
                             help='Work mode: 0=Low/Eco, 1=Medium/Standard, 2=High/Super')
-    work_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
-
-    # Target temperature
-    temp_parser = subparsers.add_parser('set-target-temp', help='Set target ASIC temperature')
-    temp_parser.add_argument('--temperature', type=int, required=True, metavar='CELSIUS',
-                            help='Target temperature in Celsius (50-90)')
-    temp_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    work_parser.set_defaults(func=cmd_set_work_mode)
+    return work_parser
 
-    # Voltage
-    get_volt_parser = subparsers.add_parser('get-voltage', help='Get voltage information')
-    get_volt_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
 
-    # Get fan speed
-    get_fan_parser = subparsers.add_parser('get-fan', help='Get current fan speed')
-    get_fan_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
-
-    # Get work mode
-    get_work_mode_parser = subparsers.add_parser('get-work-mode', help='Get current work mode')
-    get_work_mode_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+def _build_set_target_temp(subparsers, parents):
+    temp_parser = subparsers.add_parser('set-target-temp', parents=parents, help='Set target ASIC temperature')
+    temp_parser.add_argument('--temperature', type=ranged_int(50, 90), required=True, metavar='CELSIUS',
+                            help='Target temperature in Celsius (50-90)')
+    temp_parser.set_defaults(func=cmd_set_target_temp)
+    return temp_parser
 
-    # Get target temperature
-    get_target_temp_parser = subparsers.add_parser('get-target-temp', help='Get current target temperature')
-    get_target_temp_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
 
-    set_volt_parser = subparsers.add_parser('set-voltage', help='Set voltage (DANGEROUS - use with caution!)')
+def _build_set_voltage(subparsers, parents):
+    set_volt_parser = subparsers.add_parser('set-voltage', parents=parents, help='Set voltage (DANGEROUS - use with caution!)')
     set_volt_parser.add_argument('--voltage', type=int, required=True, metavar='VALUE',
                                 help='Voltage value (device-specific units)')
     set_volt_parser.add_argument('--force', action='store_true', help='Skip confirmation prompt')
-    set_volt_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    set_volt_parser.set_defaults(func=cmd_set_voltage)
+    return set_volt_parser
 
-    # Reboot
-    reboot_parser = subparsers.add_parser('reboot', help='Reboot the miner')
-    reboot_parser.add_argument('--delay', type=int, default=0, metavar='SECONDS',
+
+def _build_reboot(subparsers, parents):
+    reboot_parser = subparsers.add_parser('reboot', parents=parents, help='Reboot the miner')
+    reboot_parser.add_argument('--delay', type=ranged_int(0, 300), default=0, metavar='SECONDS',
                               help='Delay before reboot in seconds (0-300, default: 0)')
     reboot_parser.add_argument('--force', action='store_true', help='Skip confirmation prompt')
-    reboot_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    reboot_parser.set_defaults(func=cmd_reboot)
+    return reboot_parser
 
-    # Filter clean
-    filter_parser = subparsers.add_parser('reset-filter-clean', help='Reset filter clean reminder')
-    filter_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
 
-    # Pool configuration
-    setpool_parser = subparsers.add_parser('set-pool', help='Configure a mining pool (requires authentication)')
+def _build_set_pool(subparsers, parents):
+    setpool_parser = subparsers.add_parser('set-pool', parents=parents, help='Configure a mining pool (requires authentication)')
     setpool_parser.add_argument('--pool-id', type=int, required=True, choices=[0, 1, 2],
                                help='Pool ID to configure (0, 1, or 2)')
     setpool_parser.add_argument('--url', required=True, help='Pool URL (e.g., stratum+tcp://pool.example.com:3333)')
     setpool_parser.add_argument('--username', required=True, help='Pool username/worker name')
     setpool_parser.add_argument('--pool-password', required=True, help='Pool password (use "x" if not required)')
     setpool_parser.add_argument('--password', required=True, help='Miner admin password')
-    setpool_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    setpool_parser.set_defaults(func=cmd_set_pool)
+    return setpool_parser
+
+
+def _build_pool(subparsers, parents):
+    pool_parser = subparsers.add_parser('pool', parents=parents, help='Enable, disable or switch to a mining pool')
+    pool_parser.add_argument('--action', required=True, choices=list(_POOL_ACTIONS),
+                             help='Pool action: enable, disable or switch')
+    pool_parser.add_argument('--pool-id', type=int, required=True, choices=[0, 1, 2],
+                             help='Pool ID (0, 1, or 2)')
+    pool_parser.set_defaults(func=cmd_pool)
+    return pool_parser
+
+
+def _build_pool_alias(subparsers, parents, name, action, help_text, pool_id_help):
+    """Add one of the single-action pool commands (same as pool --action)"""
+    alias_parser = subparsers.add_parser(name, parents=parents, help=help_text)
+    alias_parser.add_argument('--pool-id', type=int, required=True, choices=[0, 1, 2],
+                              help=pool_id_help)
+    alias_parser.set_defaults(func=cmd_pool, action=action)
+    return alias_parser
+
 
-    # Pool management
-    enable_pool_parser = subparsers.add_parser('enable-pool', help='Enable a mining pool')
-    enable_pool_parser.add_argument('--pool-id', type=int, required=True, choices=[0, 1, 2],
-                                   help='Pool ID to enable (0, 1, or 2)')
-    enable_pool_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+def _build_enable_pool(subparsers, parents):
+    return _build_pool_alias(subparsers, parents, 'enable-pool', 'enable',
+                             'Enable a mining pool', 'Pool ID to enable (0, 1, or 2)')
 
-    disable_pool_parser = subparsers.add_parser('disable-pool', help='Disable a mining pool')
-    disable_pool_parser.add_argument('--pool-id', type=int, required=True, choices=[0, 1, 2],
-                                    help='Pool ID to disable (0, 1, or 2)')
-    disable_pool_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
 
-    switch_pool_parser = subparsers.add_parser('switch-pool', help='Switch to a different active pool')
-    switch_pool_parser.add_argument('--pool-id', type=int, required=True, choices=[0, 1, 2],
-                                   help='Pool ID to switch to (0, 1, or 2)')
-    switch_pool_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+def _build_disable_pool(subparsers, parents):
+    return _build_pool_alias(subparsers, parents, 'disable-pool', 'disable',
+                             'Disable a mining pool', 'Pool ID to disable (0, 1, or 2)')
 
-    priority_parser = subparsers.add_parser('set-pool-priority', help='Set pool priority order')
+
+def _build_switch_pool(subparsers, parents):
+    return _build_pool_alias(subparsers, parents, 'switch-pool', 'switch',
+                             'Switch to a different active pool', 'Pool ID to switch to (0, 1, or 2)')
+
+
+def _build_set_pool_priority(subparsers, parents):
+    priority_parser = subparsers.add_parser('set-pool-priority', parents=parents, help='Set pool priority order')
     priority_parser.add_argument('--priority', required=True, metavar='LIST',
                                 help='Comma-separated pool priority (e.g., "1,0" or "0,1,2")')
-    priority_parser.add_argument('--json', action='store_true', help='Output raw JSON response')
+    priority_parser.set_defaults(func=cmd_set_pool_priority)
+    return priority_parser
+
+
+# Subcommands with their own options: name -> builder
+_COMMAND_BUILDERS = {
+    'set-fan': _build_set_fan,
+    'set-work-mode': _build_set_work_mode,
+    'set-target-temp': _build_set_target_temp,
+    'set-voltage': _build_set_voltage,
+    'reboot': _build_reboot,
+    'set-pool': _build_set_pool,
+    'pool': _build_pool,
+    'enable-pool': _build_enable_pool,
+    'disable-pool': _build_disable_pool,
+    'switch-pool': _build_switch_pool,
+    'set-pool-priority': _build_set_pool_priority,
+}
+
+# Every subcommand: name -> builder(subparsers, parents)
+SUBCOMMANDS = {
+    **{name: functools.partial(_build_simple, name=name) for name in _SIMPLE_COMMANDS},
+    **_COMMAND_BUILDERS,
+}
+
+# Global options that consume the following token as their value:
+# option -> (attribute, type)
+_GLOBAL_VALUE_OPTIONS = {
+    '--port': ('port', int),
+    '--timeout': ('timeout', int),
+    '--hosts-file': ('hosts_file', str),
+}
+
+# Defaults of the global options, shared by build_parser() and parse_cli()
+_GLOBAL_DEFAULTS = {'port': 4028, 'timeout': 5, 'hosts_file': None}
+
+
+class CliArgs(SimpleNamespace):
+    """Parsed command line, from parse_cli() or the argparse parser
+
+    Only annotated, without class-level values, so argparse still fills in
+    its defaults. Subcommand options (--speed, --pool-id, ...) are set as
+    additional attributes.
+    """
+    ip: str
+    command: str
+    func: Callable[[AvalonMinerAPI, 'CliArgs'], None]
+    port: int
+    timeout: int
+    hosts_file: Optional[str]
+    json: bool
+
+
+def parse_cli(argv: List[str]) -> Optional[CliArgs]:
+    """Parse the command line without argparse for the common cases
+
+    Handles the global options, the IP and a command from _SIMPLE_COMMANDS.
+    An omitted IP (with --hosts-file) is returned as ''. Returns None for
+    anything else (help, other commands, invalid values), which is then
+    left to the argparse parser so validation and error messages stay the
+    same. Both produce the same arguments:
+
+    >>> all(vars(parse_cli(argv)) == vars(_parse_args(argv))
+    ...     for name in _SIMPLE_COMMANDS
+    ...     for argv in (['10.0.0.1', '--port=4029', name, '--json'],
+    ...                  ['--timeout', '3', '10.0.0.1', name],
+    ...                  ['--hosts-file', 'hosts.txt', name]))
+    True
+    """
+    args = CliArgs(json=False, ip='', **_GLOBAL_DEFAULTS)
+    command = None
+    tokens = iter(argv)
+    for token in tokens:
+        if command is not None:
+            # Only the command's own options may follow the command
+            if token != '--json':
+                return None
+            args.json = True
+        elif token.startswith('-'):
+            option, sep, value = token.partition('=')
+            spec = _GLOBAL_VALUE_OPTIONS.get(option)
+            if spec is None:
+                return None
+            if not sep:
+                value = next(tokens, None)
+                if value is None or value.startswith('-'):
+                    return None
+            try:
+                setattr(args, spec[0], spec[1](value))
+            except ValueError:
+                return None
+        elif not args.ip and token not in SUBCOMMANDS:
+            args.ip = token
+        else:
+            # The IP may be omitted (with --hosts-file), the command not
+            command = token
+
+    if command not in _SIMPLE_COMMANDS:
+        return None
+    args.command = command
+    args.func = _SIMPLE_COMMANDS[command][1]
+    return args
+
+
+def _find_command(argv: List[str]) -> Tuple[Optional[str], bool]:
+    """Find the subcommand name in argv without building the parser
+
+    Returns:
+        (command, ip_given); command is None when it can't be determined
+        cheaply (help requested before the command, unknown options,
+        unknown command), in which case all subcommands need to be
+        registered.
+    """
+    positionals = 0
+    i = 0
+    while i < len(argv):
+        token = argv[i]
+        if token.startswith('-'):
+            option = token.split('=', 1)[0]
+            if option not in _GLOBAL_VALUE_OPTIONS:
+                return None, True
+            if '=' not in token:
+                i += 1
+        else:
+            # The first positional is the command when the IP is omitted
+            positionals += 1
+            if positionals == 2 or token in SUBCOMMANDS:
+                return (token if token in SUBCOMMANDS else None), positionals == 2
+        i += 1
+    return None, True
+
+
+def _parse_args(argv: List[str]) -> CliArgs:
+    """Parse the command line with the argparse parser"""
+    command, ip_given = _find_command(argv)
+    if not ip_given:
+        # argparse can't leave out a positional in front of the subcommand
+        # once options come between them, so pass the omitted IP as ''
+        argv = [''] + argv
+    return build_parser(command).parse_args(argv, namespace=CliArgs())
 
-    args = parser.parse_args()
+
+@functools.lru_cache(maxsize=None)
+def build_parser(command: Optional[str] = None):
+    """Build the argument parser
+
+    Parsers are built once per command and reused, since parse_args()
+    doesn't modify them.
+
+    Args:
+        command: Register only this subcommand (default: register all)
+
+    Returns:
+        ArgumentParser; parsed args carry the command handler as args.func
+    """
+    # Only needed when parse_cli() can't handle the command line
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Avalon Miner CLI - Control and monitor Avalon cryptocurrency miners',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Get miner information
+  %(prog)s 192.168.1.100 info
+  %(prog)s 192.168.1.100 version
+
+  # Set fan speed
+  %(prog)s 192.168.1.100 set-fan --auto
+  %(prog)s 192.168.1.100 set-fan --speed 80
+  %(prog)s 192.168.1.100 set-fan --min-speed 30 --max-speed 100
+
+  # Set work mode
+  %(prog)s 192.168.1.100 set-work-mode --mode 1
+
+  # Manage pools
+  %(prog)s 192.168.1.100 pools
+  %(prog)s 192.168.1.100 pool --action switch --pool-id 1
+        """
+    )
+
+    parser.add_argument('ip', help='Miner IP address (comma-separated list for several miners; '
+                                   'may be omitted with --hosts-file)')
+    parser.add_argument('--port', type=int, default=_GLOBAL_DEFAULTS['port'], help='API port (default: 4028)')
+    parser.add_argument('--timeout', type=int, default=_GLOBAL_DEFAULTS['timeout'], help='Connection timeout in seconds (default: 5)')
+    parser.add_argument('--hosts-file', default=_GLOBAL_DEFAULTS['hosts_file'], metavar='FILE',
+                        help='Also run the command against the miners listed in FILE (one IP per line)')
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+    subparsers.required = True
+
+    # Options shared by every subcommand
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help='Output raw JSON response')
+
+    for name in ([command] if command in SUBCOMMANDS else SUBCOMMANDS):
+        SUBCOMMANDS[name](subparsers, [common])
+
+    return parser
+
+
+def _fail(message: str) -> NoReturn:
+    """Print an error message to stderr and exit with status 1"""
+    # The process is exiting; write straight to the file descriptor
+    sys.stderr.flush()
+    os.write(2, f"{message}\n".encode('utf-8', 'backslashreplace'))
+    raise SystemExit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point
+
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    args: Optional[CliArgs] = parse_cli(argv)
+    if args is None:
+        # Only register the subcommand that is actually being run
+        args = _parse_args(argv)
+
+    # Collect miners from the IP argument and the optional hosts file
+    hosts: List[str] = [h.strip() for h in args.ip.split(',') if h.strip()]
+    if args.hosts_file:
+        hosts.extend(load_hosts_file(args.hosts_file))
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        _fail("Error: No miner IP address specified")
+
+    if len(hosts) > 1:
+        if args.command not in _BATCH_COMMANDS:
+            _fail(f"Error: '{args.command}' can only be run against a single miner")
+        sys.exit(run_batch(hosts, args, args.func))
 
     # Create API instance
     try:
-        api = AvalonMinerAPI(args.ip, args.port, args.timeout)
+        api: AvalonMinerAPI = _make_api(hosts[0], args)
     except ValueError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+        _fail(f"Error: {e}")
 
     # Execute command
     try:
-        command_map = {
-            'version': cmd_version,
-            'summary': cmd_summary,
-            'estats': cmd_estats,
-            'lcd': cmd_lcd,
-            'pools': cmd_pools,
-            'info': cmd_info,
-            'set-fan': cmd_set_fan_speed,
-            'get-fan': cmd_get_fan,
-            'set-work-mode': cmd_set_work_mode,
-            'get-work-mode': cmd_get_work_mode,
-            'set-target-temp': cmd_set_target_temp,
-            'get-target-temp': cmd_get_target_temp,
-            'get-voltage': cmd_get_voltage,
-            'set-voltage': cmd_set_voltage,
-            'reboot': cmd_reboot,
-            'reset-filter-clean': cmd_reset_filter_clean,
-            'set-pool': cmd_set_pool,
-            'enable-pool': cmd_enable_pool,
-            'disable-pool': cmd_disable_pool,
-            'switch-pool': cmd_switch_pool,
-            'set-pool-priority': cmd_set_pool_priority,
-        }
-
-        command_map[args.command](api, args)
+        args.func(api, args)
 
     except ConnectionError as e:
-        print(f"Connection Error: {e}", file=sys.stderr)
-        sys.exit(1)
+        _fail(f"Connection Error: {e}")
     except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+        _fail(f"Error: {e}")
 
 
 if __name__ == '__main__':
@@ -53,7 +53,7 @@ class AvalonMinerApiClient:
             writer.write(json_cmd.encode("utf-8"))
             await writer.drain()
 
-            response = b""
+            chunks: list[bytes] = []
             try:
                 while True:
                     chunk = await asyncio.wait_for(
@@ -61,7 +61,7 @@ class AvalonMinerApiClient:
                     )
                     if not chunk:
                         break
-                    response += chunk
+                    chunks.append(chunk)
             except asyncio.TimeoutError:
                 pass
 
@@ -71,7 +71,7 @@ class AvalonMinerApiClient:
             except Exception:
                 pass
 
-            response_str = response.decode("utf-8").rstrip("\x00").strip()
+            response_str = b"".join(chunks).decode("utf-8").rstrip("\x00").strip()
             return json.loads(response_str)
 
         except asyncio.TimeoutError as exc: